@@ -1,4 +1,5 @@
-from setuptools import setup, find_packages
+import os
+from setuptools import Extension, setup, find_packages
 
 with open("README.md", "r", encoding="utf-8") as fh:
     long_description = fh.read()
@@ -6,6 +7,21 @@ with open("README.md", "r", encoding="utf-8") as fh:
 with open("requirements.txt", "r", encoding="utf-8") as fh:
     requirements = fh.read().splitlines()
 
+# Optionally compile the parser with Cython (TRUCODE_CYTHON=1). The .py
+# sources are always installed, so a source-only install still works.
+ext_modules = []
+if os.environ.get("TRUCODE_CYTHON") == "1":
+    try:
+        from Cython.Build import cythonize
+    except ImportError:
+        # pip hides build output, so fail instead of quietly skipping
+        # the compiled parser the user asked for
+        raise RuntimeError("TRUCODE_CYTHON=1 requires Cython in the build environment; "
+                           "run 'pip install cython' and install with --no-build-isolation")
+    # Name the extension explicitly so it builds as trucode.analyzer.parser
+    ext_modules = cythonize([Extension("trucode.analyzer.parser", ["trucode/analyzer/parser.py"])],
+                            language_level=3)
+
 setup(
     name="trucode",
     version="0.1.0",
@@ -21,8 +37,9 @@ setup(
         "License :: OSI Approved :: MIT License",
         "Operating System :: OS Independent",
     ],
-    python_requires=">=3.7",
+    python_requires=">=3.10",
     install_requires=requirements,
+    ext_modules=ext_modules,
     entry_points={
         "console_scripts": [
             "trucode=trucode.main:main",
@@ -5,9 +5,37 @@ This package contains tools for analyzing Python code,
 detecting issues, and suggesting improvements.
 """
 
-from trucode.analyzer.parser import CodeParser
+from functools import lru_cache
+
+from trucode.analyzer.parser import CodeParser, FunctionInfo, ClassInfo
 from trucode.analyzer.detector import IssueDetector
 from trucode.analyzer.suggester import CodeSuggester
-from trucode.analyzer.model_wrapper import ModelWrapper
 
-__all__ = ['CodeParser', 'IssueDetector', 'CodeSuggester', 'ModelWrapper']
\ No newline at end of file
+__all__ = ['CodeParser', 'FunctionInfo', 'ClassInfo', 'IssueDetector', 'CodeSuggester', 'ModelWrapper',
+           'get_parser', 'get_detector', 'get_suggester']
+
+@lru_cache(maxsize=None)
+def get_parser():
+    """Return the CodeParser shared by every analysis in this process."""
+    return CodeParser()
+
+@lru_cache(maxsize=None)
+def get_detector():
+    """Return the IssueDetector shared by every analysis in this process."""
+    return IssueDetector()
+
+def get_suggester(load_model=True):
+    """Return the shared CodeSuggester, one per AI setting."""
+    # Normalised here so every spelling of the same setting shares one suggester
+    return _cached_suggester(bool(load_model))
+
+@lru_cache(maxsize=None)
+def _cached_suggester(load_model):
+    return CodeSuggester(load_model=load_model)
+
+def __getattr__(name):
+    """Import ModelWrapper on first access instead of at package import."""
+    if name == 'ModelWrapper':
+        from trucode.analyzer.model_wrapper import ModelWrapper
+        return ModelWrapper
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -1,10 +1,140 @@
 import ast
-import re
-from trucode.utils.helpers import get_line_content, extract_code_from_line
+import builtins
+import hashlib
+from collections import OrderedDict
+
+# Built-in names plus the conventional method receivers
+_BUILTINS = frozenset(dir(builtins)) | {'self', 'cls'}
+
+# Most analyzed sources whose issues are kept for reuse
+_CACHE_SIZE = 512
+
+class _Collector:
+    """Collect everything the detectors need from the AST in a single pass."""
+    
+    def __init__(self):
+        self.defined_names = set()
+        # Maps each loaded name to the first line it is used on
+        self.used_names = {}
+        self.imports = {}
+        self.assignments = {}
+        self.try_handlers = []
+        self.constants = {}
+        self.has_main_guard = False
+    
+    def visit(self, tree):
+        """Walk the tree in source order, dispatching on each node's exact type."""
+        handlers = self._handlers
+        stack = [tree]
+        while stack:
+            node = stack.pop()
+            handler = handlers.get(type(node))
+            if handler is not None:
+                handler(self, node)
+            
+            # Same children as ast.iter_child_nodes, without the generator
+            # frame; pushed in reverse so they are popped in source order
+            for field in reversed(node._fields):
+                value = getattr(node, field, None)
+                if isinstance(value, list):
+                    for item in reversed(value):
+                        if isinstance(item, ast.AST):
+                            stack.append(item)
+                elif isinstance(value, ast.AST):
+                    stack.append(value)
+        
+        self.has_main_guard = self._find_main_guard(tree)
+    
+    def visit_Name(self, node):
+        if isinstance(node.ctx, ast.Store):
+            self.defined_names.add(node.id)
+        elif isinstance(node.ctx, ast.Load):
+            line_num = self.used_names.get(node.id)
+            if line_num is None or node.lineno < line_num:
+                self.used_names[node.id] = node.lineno
+    
+    def visit_Import(self, node):
+        for name in node.names:
+            self.imports[name.name.split('.')[0]] = node.lineno
+    
+    def visit_ImportFrom(self, node):
+        for name in node.names:
+            if name.asname:
+                self.imports[name.asname] = node.lineno
+            else:
+                self.imports[name.name] = node.lineno
+    
+    def visit_Assign(self, node):
+        for target in node.targets:
+            if isinstance(target, ast.Name):
+                self.assignments[target.id] = target.lineno
+    
+    def visit_Try(self, node):
+        self.try_handlers.extend(node.handlers)
+    
+    def visit_Constant(self, node):
+        value = node.value
+        
+        # Only numbers, strings and bytes can be magic values
+        if not isinstance(value, (int, float, str, bytes)):
+            return
+        
+        # Skip small numbers and empty strings
+        if isinstance(value, (int, float)):
+            if abs(value) <= 1:
+                return
+        elif len(value) <= 1:
+            return
+        
+        # Track constants by their type and value, so 2 and '2' stay apart
+        key = (type(value), value)
+        if key in self.constants:
+            self.constants[key]['count'] += 1
+        else:
+            self.constants[key] = {
+                'count': 1,
+                'line': node.lineno,
+                'value': value
+            }
+    
+    def _find_main_guard(self, tree):
+        """Look for the main guard among module-level statements only."""
+        # Top-level if/try blocks are searched too, but never function or
+        # class bodies, where a main guard would have no effect
+        blocks = [getattr(tree, 'body', [])]
+        while blocks:
+            for node in blocks.pop():
+                if type(node) is ast.If:
+                    # Check for if __name__ == '__main__':
+                    match node.test:
+                        case ast.Compare(left=ast.Name(id='__name__'),
+                                         ops=[ast.Eq(), *_],
+                                         comparators=[ast.Constant(value='__main__'), *_]):
+                            return True
+                    blocks.extend((node.body, node.orelse))
+                elif type(node) is ast.Try:
+                    blocks.extend((node.body, node.orelse, node.finalbody))
+        return False
+    
+    # Node type -> handler; children are always walked by visit()
+    _handlers = {
+        ast.Name: visit_Name,
+        ast.Import: visit_Import,
+        ast.ImportFrom: visit_ImportFrom,
+        ast.Assign: visit_Assign,
+        ast.Try: visit_Try,
+        ast.Constant: visit_Constant,
+    }
 
 class IssueDetector:
     """Detect common issues in Python code."""
     
+    def __init__(self):
+        """Initialize the detector with an empty result cache."""
+        # Issues found so far, keyed by a hash of the analyzed source and
+        # kept in least recently used order
+        self._issue_cache = OrderedDict()
+    
     def detect_issues(self, parsed_code):
         """
         Analyze code and detect potential issues.
@@ -13,30 +143,50 @@ class IssueDetector:
         if not parsed_code:
             return []
         
+        # Only a real syntax tree can be handed to the detectors
+        tree = parsed_code.get('ast')
+        has_ast = isinstance(tree, ast.AST)
+        
         # If the file has syntax errors and no AST, return just the syntax error
-        if parsed_code.get('has_syntax_errors', False) and not parsed_code.get('ast'):
-            error_info = parsed_code.get('syntax_error_info', {})
-            issues = [{
-                'type': 'Syntax Error',
-                'line': error_info.get('line', 1),
-                'message': f"Syntax error: {error_info.get('message', 'Unknown syntax error')}",
-                'suggestion': "Fix the syntax error to make the code valid."
-            }]
-            return issues
+        if parsed_code.get('has_syntax_errors', False) and not has_ast:
+            return self._detect_syntax_errors(parsed_code)
         
         issues = []
         
         # Run all detectors, but only if we have an AST to analyze
-        if parsed_code.get('ast'):
+        if has_ast:
+            code = parsed_code['code']
+            
+            # Unchanged code yields the same issues, so reuse earlier results
+            cache_key = parsed_code.get('hash')
+            if cache_key is None:
+                cache_key = hashlib.blake2b(code.encode('utf-8'), digest_size=16).digest()
+            cached = self._issue_cache.get(cache_key)
+            if cached is not None:
+                self._issue_cache.move_to_end(cache_key)
+                return list(cached)
+            
+            functions = parsed_code.get('functions') or ()
+            classes = parsed_code.get('classes') or ()
+            lines = parsed_code.get('lines') or ()
+            
+            # Gather names, imports, handlers and constants in one traversal
+            collector = _Collector()
+            collector.visit(tree)
+            
             issues.extend(self._detect_syntax_errors(parsed_code))
-            issues.extend(self._detect_undefined_variables(parsed_code))
-            issues.extend(self._detect_unused_imports(parsed_code))
-            issues.extend(self._detect_unused_variables(parsed_code))
-            issues.extend(self._detect_complex_functions(parsed_code))
-            issues.extend(self._detect_missing_docstrings(parsed_code))
-            issues.extend(self._detect_exception_handling(parsed_code))
-            issues.extend(self._detect_hardcoded_values(parsed_code))
-            issues.extend(self._detect_main_guard(parsed_code))
+            issues.extend(self._detect_undefined_variables(collector))
+            issues.extend(self._detect_unused_imports(collector))
+            issues.extend(self._detect_unused_variables(collector))
+            issues.extend(self._detect_complex_functions(functions))
+            issues.extend(self._detect_missing_docstrings(functions, classes))
+            issues.extend(self._detect_exception_handling(collector))
+            issues.extend(self._detect_hardcoded_values(collector))
+            issues.extend(self._detect_main_guard(functions, lines, collector))
+            
+            self._issue_cache[cache_key] = list(issues)
+            if len(self._issue_cache) > _CACHE_SIZE:
+                self._issue_cache.popitem(last=False)
         else:
             # If we don't have an AST, just report it as a syntax error
             issues.append({
@@ -49,113 +199,42 @@ class IssueDetector:
         return issues
     
     def _detect_syntax_errors(self, parsed_code):
-        """Check for syntax errors in the code."""
+        """Report the syntax error recorded by the parser, if any."""
         issues = []
-        try:
-            ast.parse(parsed_code['code'])
-        except SyntaxError as e:
+        # The parser already tried to parse the code, so don't parse it again
+        if parsed_code.get('has_syntax_errors', False):
+            error_info = parsed_code.get('syntax_error_info') or {}
             issues.append({
                 'type': 'Syntax Error',
-                'line': e.lineno,
-                'message': f"Syntax error: {e.msg}",
+                'line': error_info.get('line', 1),
+                'message': f"Syntax error: {error_info.get('message', 'Unknown syntax error')}",
                 'suggestion': "Fix the syntax error to make the code valid."
             })
         return issues
     
-    def _detect_undefined_variables(self, parsed_code):
+    def _detect_undefined_variables(self, collector):
         """Detect potentially undefined variables."""
         issues = []
         
-        # Skip if no AST
-        if not parsed_code.get('ast'):
-            return issues
-            
-        defined_names = set()
-        used_names = set()
-        
-        # Helper function to check nodes
-        def process_node(node):
-            if node is None:
-                return
-                
-            if isinstance(node, ast.Name):
-                if isinstance(node.ctx, ast.Store):
-                    defined_names.add(node.id)
-                elif isinstance(node.ctx, ast.Load):
-                    used_names.add(node.id)
-        
-        # Walk through all nodes
-        try:
-            for node in ast.walk(parsed_code['ast']):
-                process_node(node)
-        except (AttributeError, TypeError) as e:
-            # If we encounter an error during walking, just return no issues
-            print(f"Warning: Error during variable analysis: {e}")
-            return []
-        
-        # Built-in names and common globals that might be imported
-        builtins = dir(__builtins__)
-        
         # Check for used but not defined names
-        for name in used_names:
-            if name not in defined_names and name not in builtins:
-                # Find line number where this name is used
-                line_num = None
-                for i, line in enumerate(parsed_code['lines'], 1):
-                    if re.search(rf'\b{name}\b', line):
-                        line_num = i
-                        break
-                
-                if line_num:
-                    issues.append({
-                        'type': 'Potential Undefined Variable',
-                        'line': line_num,
-                        'message': f"Variable '{name}' is used but might not be defined.",
-                        'suggestion': f"Make sure '{name}' is defined before use, or check for typos."
-                    })
+        for name, line_num in collector.used_names.items():
+            if name not in collector.defined_names and name not in _BUILTINS:
+                issues.append({
+                    'type': 'Potential Undefined Variable',
+                    'line': line_num,
+                    'message': f"Variable '{name}' is used but might not be defined.",
+                    'suggestion': f"Make sure '{name}' is defined before use, or check for typos."
+                })
         
         return issues
     
-    def _detect_unused_imports(self, parsed_code):
+    def _detect_unused_imports(self, collector):
         """Detect imported modules that are not used."""
         issues = []
         
-        # Skip if no AST
-        if not parsed_code.get('ast'):
-            return issues
-            
-        # Get all imported names
-        imported_names = {}
-        try:
-            for node in ast.walk(parsed_code['ast']):
-                if isinstance(node, ast.Import):
-                    for name in node.names:
-                        imported_names[name.name.split('.')[0]] = node.lineno
-                elif isinstance(node, ast.ImportFrom):
-                    for name in node.names:
-                        if name.asname:
-                            imported_names[name.asname] = node.lineno
-                        else:
-                            imported_names[name.name] = node.lineno
-        except (AttributeError, TypeError) as e:
-            # If we encounter an error during walking, just return no issues
-            print(f"Warning: Error during import analysis: {e}")
-            return []
-        
-        # Get all used names
-        used_names = set()
-        try:
-            for node in ast.walk(parsed_code['ast']):
-                if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load):
-                    used_names.add(node.id)
-        except (AttributeError, TypeError) as e:
-            # If we encounter an error during walking, just return no issues
-            print(f"Warning: Error during name usage analysis: {e}")
-            return []
-        
         # Find unused imports
-        for imported_name, line_num in imported_names.items():
-            if imported_name not in used_names:
+        for imported_name, line_num in collector.imports.items():
+            if imported_name not in collector.used_names:
                 issues.append({
                     'type': 'Unused Import',
                     'line': line_num,
@@ -165,34 +244,13 @@ class IssueDetector:
         
         return issues
     
-    def _detect_unused_variables(self, parsed_code):
+    def _detect_unused_variables(self, collector):
         """Detect defined variables that are not used."""
         issues = []
         
-        # Skip if no AST
-        if not parsed_code.get('ast'):
-            return issues
-            
-        assigned_names = {}
-        used_names = set()
-        
-        # Find all assigned and used names
-        try:
-            for node in ast.walk(parsed_code['ast']):
-                if isinstance(node, ast.Assign):
-                    for target in node.targets:
-                        if isinstance(target, ast.Name):
-                            assigned_names[target.id] = target.lineno
-                elif isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load):
-                    used_names.add(node.id)
-        except (AttributeError, TypeError) as e:
-            # If we encounter an error during walking, just return no issues
-            print(f"Warning: Error during variable usage analysis: {e}")
-            return []
-        
         # Check for unused variables (ignore if starts with underscore)
-        for name, line_num in assigned_names.items():
-            if name not in used_names and not name.startswith('_'):
+        for name, line_num in collector.assignments.items():
+            if name not in collector.used_names and not name.startswith('_'):
                 issues.append({
                     'type': 'Unused Variable',
                     'line': line_num,
@@ -202,125 +260,80 @@ class IssueDetector:
         
         return issues
     
-    def _detect_complex_functions(self, parsed_code):
+    def _detect_complex_functions(self, functions):
         """Detect functions that are too complex or too long."""
         issues = []
         
-        # Skip if no functions detected
-        if not parsed_code.get('functions'):
-            return issues
-            
-        for func in parsed_code['functions']:
-            function_length = func['end_line'] - func['start_line']
+        for func in functions:
+            function_length = func.end_line - func.start_line
             
             # Check for very long functions
             if function_length > 50:
                 issues.append({
                     'type': 'Complex Function',
-                    'line': func['start_line'],
-                    'message': f"Function '{func['name']}' is very long ({function_length} lines).",
+                    'line': func.start_line,
+                    'message': f"Function '{func.name}' is very long ({function_length} lines).",
                     'suggestion': "Consider breaking this function into smaller, more focused functions."
                 })
             
             # Check for functions with too many arguments
-            if len(func['args']) > 5:
+            if len(func.args) > 5:
                 issues.append({
                     'type': 'Too Many Arguments',
-                    'line': func['start_line'],
-                    'message': f"Function '{func['name']}' has {len(func['args'])} parameters, which might be too many.",
+                    'line': func.start_line,
+                    'message': f"Function '{func.name}' has {len(func.args)} parameters, which might be too many.",
                     'suggestion': "Consider grouping related parameters into a class or dictionary."
                 })
         
         return issues
     
-    def _detect_missing_docstrings(self, parsed_code):
+    def _detect_missing_docstrings(self, functions, classes):
         """Detect missing docstrings in functions and classes."""
         issues = []
         
         # Check functions
-        for func in parsed_code.get('functions', []):
-            if not func['docstring'] and not func['name'].startswith('_'):
+        for func in functions:
+            if not func.docstring and not func.name.startswith('_'):
                 issues.append({
                     'type': 'Missing Docstring',
-                    'line': func['start_line'],
-                    'message': f"Function '{func['name']}' lacks a docstring.",
+                    'line': func.start_line,
+                    'message': f"Function '{func.name}' lacks a docstring.",
                     'suggestion': "Add a descriptive docstring to document the function's purpose and usage."
                 })
         
         # Check classes
-        for cls in parsed_code.get('classes', []):
-            if not cls['docstring']:
+        for cls in classes:
+            if not cls.docstring:
                 issues.append({
                     'type': 'Missing Docstring',
-                    'line': cls['start_line'],
-                    'message': f"Class '{cls['name']}' lacks a docstring.",
+                    'line': cls.start_line,
+                    'message': f"Class '{cls.name}' lacks a docstring.",
                     'suggestion': "Add a descriptive docstring to document the class's purpose and usage."
                 })
         
         return issues
     
-    def _detect_exception_handling(self, parsed_code):
+    def _detect_exception_handling(self, collector):
         """Detect bare exceptions and other exception handling issues."""
         issues = []
         
-        # Skip if no AST
-        if not parsed_code.get('ast'):
-            return issues
-            
-        try:
-            for node in ast.walk(parsed_code['ast']):
-                if isinstance(node, ast.Try):
-                    for handler in node.handlers:
-                        if handler.type is None:
-                            issues.append({
-                                'type': 'Bare Exception',
-                                'line': handler.lineno,
-                                'message': "Using a bare 'except:' clause catches all exceptions, including KeyboardInterrupt and SystemExit.",
-                                'suggestion': "Catch specific exceptions instead, like 'except ValueError:' or use 'except Exception:' if necessary."
-                            })
-        except (AttributeError, TypeError) as e:
-            # If we encounter an error during walking, just return no issues
-            print(f"Warning: Error during exception analysis: {e}")
-            return []
+        for handler in collector.try_handlers:
+            if handler.type is None:
+                issues.append({
+                    'type': 'Bare Exception',
+                    'line': handler.lineno,
+                    'message': "Using a bare 'except:' clause catches all exceptions, including KeyboardInterrupt and SystemExit.",
+                    'suggestion': "Catch specific exceptions instead, like 'except ValueError:' or use 'except Exception:' if necessary."
+                })
         
         return issues
     
-    def _detect_hardcoded_values(self, parsed_code):
+    def _detect_hardcoded_values(self, collector):
         """Detect hardcoded values that might be better as constants."""
         issues = []
         
-        # Skip if no AST
-        if not parsed_code.get('ast'):
-            return issues
-            
-        seen_values = {}
-        
-        try:
-            for node in ast.walk(parsed_code['ast']):
-                if isinstance(node, ast.Constant):
-                    # Skip small numbers and empty strings
-                    if isinstance(node.value, (int, float)) and abs(node.value) <= 1:
-                        continue
-                    if isinstance(node.value, str) and len(node.value) <= 1:
-                        continue
-                    
-                    # Track constants by their value and location
-                    value_str = str(node.value)
-                    if value_str in seen_values:
-                        seen_values[value_str]['count'] += 1
-                    else:
-                        seen_values[value_str] = {
-                            'count': 1,
-                            'line': node.lineno,
-                            'value': node.value
-                        }
-        except (AttributeError, TypeError) as e:
-            # If we encounter an error during walking, just return no issues
-            print(f"Warning: Error during constants analysis: {e}")
-            return []
-        
         # Report repeated hardcoded values
-        for value_str, info in seen_values.items():
+        for info in collector.constants.values():
             if info['count'] > 2:
                 value_display = repr(info['value']) if isinstance(info['value'], str) else str(info['value'])
                 issues.append({
@@ -332,37 +345,17 @@ class IssueDetector:
         
         return issues
     
-    def _detect_main_guard(self, parsed_code):
+    def _detect_main_guard(self, functions, lines, collector):
         """Check if the script has a proper if __name__ == '__main__' guard."""
         issues = []
         
-        # Skip if no functions are defined (might be a simple script) or no AST
-        if not parsed_code.get('functions') or not parsed_code.get('ast'):
+        # Skip if no functions are defined (might be a simple script)
+        if not functions:
             return issues
         
-        has_main_guard = False
-        try:
-            for node in ast.walk(parsed_code['ast']):
-                if isinstance(node, ast.If):
-                    # Check for if __name__ == '__main__':
-                    if (isinstance(node.test, ast.Compare) and 
-                        isinstance(node.test.left, ast.Name) and
-                        node.test.left.id == '__name__' and
-                        len(node.test.ops) > 0 and
-                        isinstance(node.test.ops[0], ast.Eq) and
-                        len(node.test.comparators) > 0 and
-                        isinstance(node.test.comparators[0], ast.Constant) and
-                        node.test.comparators[0].value == '__main__'):
-                        has_main_guard = True
-                        break
-        except (AttributeError, TypeError) as e:
-            # If we encounter an error during walking, just return no issues
-            print(f"Warning: Error during main guard analysis: {e}")
-            return []
-        
-        if not has_main_guard:
+        if not collector.has_main_guard:
             # Find the last line to suggest adding the guard there
-            last_line = len(parsed_code['lines'])
+            last_line = len(lines)
             issues.append({
                 'type': 'Missing Main Guard',
                 'line': last_line,
@@ -1,10 +1,21 @@
 import os
 import json
+import hashlib
 import tempfile
 
+# Bump when the format of cached analysis results changes
+_CACHE_VERSION = 1
+
+# Most prompts padded into a single generate call; memory for the padded
+# batch grows with every prompt added
+_MAX_BATCH = 8
+
 class ModelWrapper:
     """Wrapper for AI model to analyze code."""
     
+    # Loaded models shared by every wrapper in the process, keyed by model name
+    _shared_models = {}
+    
     def __init__(self):
         """Initialize the model wrapper."""
         self.model = None
@@ -13,23 +24,28 @@ class ModelWrapper:
         self.cache_dir = os.path.join(tempfile.gettempdir(), "trucode_model_cache")
         
         # Create cache directory if it doesn't exist
-        if not os.path.exists(self.cache_dir):
-            try:
-                os.makedirs(self.cache_dir)
-            except Exception as e:
-                print(f"Could not create cache directory: {e}")
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+        except OSError as e:
+            print(f"Could not create cache directory: {e}")
     
     def load_model(self):
         """Load the model if not already loaded."""
         if not self.loaded:
+            # Reuse a model another wrapper in this process already loaded
+            if self.model_name in ModelWrapper._shared_models:
+                self.model = ModelWrapper._shared_models[self.model_name]
+                self.loaded = True
+                return self.loaded
+            
             try:
                 print(f"Loading model {self.model_name}... (this may take a minute)")
                 
                 # Try importing transformers
                 try:
                     from transformers import pipeline
-                    # Use "cpu" to ensure it works on all systems
-                    self.model = pipeline("text-generation", model=self.model_name, device="cpu")
+                    self.model = self._create_pipeline(pipeline)
+                    ModelWrapper._shared_models[self.model_name] = self.model
                     self.loaded = True
                     print("Model loaded successfully!")
                 except ImportError:
@@ -45,6 +61,37 @@ class ModelWrapper:
                 return False
         return self.loaded
     
+    def _create_pipeline(self, pipeline):
+        """Create the text generation pipeline, preferring cached weights."""
+        try:
+            # Load from the local cache without contacting the model hub
+            model, tokenizer = self._load_quantized_model(local_files_only=True)
+        except OSError:
+            # Weights are not cached yet, so download them into the cache
+            model, tokenizer = self._load_quantized_model(local_files_only=False)
+        
+        # Batched generation pads prompts on the left with the end-of-text token
+        if tokenizer.pad_token is None:
+            tokenizer.pad_token = tokenizer.eos_token
+        tokenizer.padding_side = 'left'
+        
+        # Use "cpu" to ensure it works on all systems
+        return pipeline("text-generation", model=model, tokenizer=tokenizer, device="cpu")
+    
+    def _load_quantized_model(self, local_files_only):
+        """Load the tokenizer and an int8 dynamically quantized model."""
+        import torch
+        from transformers import AutoModelForCausalLM, AutoTokenizer
+        
+        # Weights live in the user's regular Hugging Face cache
+        tokenizer = AutoTokenizer.from_pretrained(self.model_name, local_files_only=local_files_only)
+        model = AutoModelForCausalLM.from_pretrained(self.model_name, local_files_only=local_files_only)
+        model.eval()
+        
+        # int8 weights for the linear layers cut memory traffic during CPU generation
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        return model, tokenizer
+    
     def analyze_code(self, code_snippet):
         """
         Analyze code using the AI model.
@@ -55,33 +102,102 @@ class ModelWrapper:
         Returns:
             Dictionary with analysis results
         """
+        return self.analyze_code_batch([code_snippet])[0]
+    
+    def analyze_code_batch(self, code_snippets):
+        """
+        Analyze several code snippets with a single batched model call.
+        
+        Args:
+            code_snippets: List of Python code strings
+        
+        Returns:
+            List of dictionaries with analysis results, one per snippet
+        """
+        results = [None] * len(code_snippets)
+        pending = []
+        
+        # Check if we have cached results
+        for index, code_snippet in enumerate(code_snippets):
+            cache_file = self._get_cache_file(code_snippet)
+            if os.path.exists(cache_file):
+                try:
+                    with open(cache_file, 'r') as f:
+                        results[index] = json.load(f)
+                    continue
+                except Exception:
+                    # If reading cache fails, proceed with analysis
+                    pass
+            pending.append((index, code_snippet, cache_file))
+        
+        if not pending:
+            return results
+        
+        # Only load the model once there is something the cache can't answer
         if not self.load_model():
             # Return basic analysis if model couldn't be loaded
-            return {
-                "description": "Basic code analysis (AI model not available)",
-                "suggestions": [
-                    "Consider adding comments to explain complex logic",
-                    "Add error handling for robust code",
-                    "Break down large functions into smaller ones"
-                ]
-            }
-        
-        # Create a cache key from the first 100 chars of the code
-        cache_key = hash(code_snippet[:100])
-        cache_file = os.path.join(self.cache_dir, f"analysis_{cache_key}.json")
-        
-        # Check if we have a cached result
-        if os.path.exists(cache_file):
-            try:
-                with open(cache_file, 'r') as f:
-                    return json.load(f)
-            except Exception:
-                # If reading cache fails, proceed with analysis
-                pass
+            for index, _, _ in pending:
+                results[index] = {
+                    "description": "Basic code analysis (AI model not available)",
+                    "suggestions": [
+                        "Consider adding comments to explain complex logic",
+                        "Add error handling for robust code",
+                        "Break down large functions into smaller ones"
+                    ]
+                }
+            return results
         
         try:
-            # Construct prompt for the model
-            prompt = f"""
+            # Generate responses for all uncached snippets in one call; the
+            # pipeline splits them into batches of at most _MAX_BATCH
+            prompts = [self._build_prompt(code_snippet) for _, code_snippet, _ in pending]
+            outputs = self.model(
+                prompts,
+                max_new_tokens=128,
+                num_return_sequences=1,
+                temperature=0.5,
+                use_cache=True,
+                pad_token_id=self.model.tokenizer.eos_token_id,
+                batch_size=min(len(prompts), _MAX_BATCH)
+            )
+            
+            for (index, _, cache_file), output in zip(pending, outputs):
+                result = self._parse_analysis(output[0]['generated_text'])
+                
+                # Cache the result
+                try:
+                    with open(cache_file, 'w') as f:
+                        json.dump(result, f)
+                except Exception as e:
+                    print(f"Could not cache analysis result: {e}")
+                
+                results[index] = result
+        
+        except Exception as e:
+            print(f"Error during AI analysis: {e}")
+            for index, _, _ in pending:
+                results[index] = {
+                    "description": "Error during AI analysis",
+                    "suggestions": [
+                        "Add proper error handling",
+                        "Ensure code follows PEP 8 style guidelines",
+                        "Consider adding unit tests"
+                    ]
+                }
+        
+        return results
+    
+    def _get_cache_file(self, code_snippet):
+        """Return the path of the cached analysis for a code snippet."""
+        # Create a stable cache key from the model, cache format and the code
+        # that actually goes into the prompt
+        key_material = f"{self.model_name}\0{_CACHE_VERSION}\0{code_snippet[:500]}"
+        cache_key = hashlib.blake2b(key_material.encode('utf-8'), digest_size=16).hexdigest()
+        return os.path.join(self.cache_dir, f"analysis_{cache_key}.json")
+    
+    def _build_prompt(self, code_snippet):
+        """Construct the analysis prompt for the model."""
+        return f"""
             Analyze this Python code and identify issues, improvements, or bugs:
             
             ```python
@@ -90,53 +206,25 @@ class ModelWrapper:
             
             Analysis:
             """
-            
-            # Generate response
-            result = self.model(
-                prompt, 
-                max_length=200, 
-                num_return_sequences=1, 
-                temperature=0.5
-            )
-            
-            # Extract generated text and process it
-            generated_text = result[0]['generated_text']
-            analysis_part = generated_text.split("Analysis:")[-1].strip()
-            
-            # Split into lines for easier processing
-            lines = [line.strip() for line in analysis_part.split("\n") if line.strip()]
-            
-            # Extract suggestions
-            suggestions = []
-            for line in lines:
-                # Look for lines that might be suggestions
-                if line.startswith("-") or line.startswith("*"):
-                    suggestions.append(line[1:].strip())
-                elif "should" in line or "could" in line or "consider" in line:
-                    suggestions.append(line)
-            
-            result = {
-                "description": "AI-powered code analysis",
-                "full_analysis": analysis_part,
-                "suggestions": suggestions[:3]  # Limit to top 3 suggestions
-            }
-            
-            # Cache the result
-            try:
-                with open(cache_file, 'w') as f:
-                    json.dump(result, f)
-            except Exception as e:
-                print(f"Could not cache analysis result: {e}")
-                
-            return result
-            
-        except Exception as e:
-            print(f"Error during AI analysis: {e}")
-            return {
-                "description": "Error during AI analysis",
-                "suggestions": [
-                    "Add proper error handling",
-                    "Ensure code follows PEP 8 style guidelines",
-                    "Consider adding unit tests"
-                ]
-            }
\ No newline at end of file
+    
+    def _parse_analysis(self, generated_text):
+        """Extract the analysis and suggestions from generated text."""
+        analysis_part = generated_text.split("Analysis:")[-1].strip()
+        
+        # Split into lines for easier processing
+        lines = [line.strip() for line in analysis_part.split("\n") if line.strip()]
+        
+        # Extract suggestions
+        suggestions = []
+        for line in lines:
+            # Look for lines that might be suggestions
+            if line.startswith("-") or line.startswith("*"):
+                suggestions.append(line[1:].strip())
+            elif "should" in line or "could" in line or "consider" in line:
+                suggestions.append(line)
+        
+        return {
+            "description": "AI-powered code analysis",
+            "full_analysis": analysis_part,
+            "suggestions": suggestions[:3]  # Limit to top 3 suggestions
+        }
\ No newline at end of file
@@ -1,32 +1,158 @@
 import ast
+import hashlib
 import os
 import re
+import sys
 import tokenize
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from io import BytesIO
 
+try:
+    # Optional faster traversal; the extractors don't depend on visit order
+    from fast_walk import walk_unordered
+except ImportError:
+    from ast import walk as walk_unordered
+
+# Buffer size for reading source files (1 MiB)
+_READ_BUFFER_SIZE = 1 << 20
+
+# Upper bound on files handed to a worker process at a time by parse_many
+_PARSE_CHUNKSIZE = 16
+
+# Import statements recognised by the text fallback when the AST is unavailable
+_IMPORT_RE = re.compile(r'^import\s+([\w.]+)')
+_FROM_IMPORT_RE = re.compile(r'^from\s+([\w.]+)\s+import\s+([\w., ]+)')
+
+@dataclass(slots=True, frozen=True)
+class FunctionInfo:
+    """A function or method definition found in the parsed code."""
+    name: str
+    docstring: str | None
+    args: tuple[str, ...]
+    start_line: int
+    end_line: int
+
+@dataclass(slots=True, frozen=True)
+class ClassInfo:
+    """A class definition found in the parsed code."""
+    name: str
+    docstring: str | None
+    methods: tuple[str, ...]
+    start_line: int
+    end_line: int
+
+class _Extractor:
+    """Collect function, class and import information from an AST in one pass."""
+    
+    def __init__(self):
+        self.functions = []
+        self.classes = []
+        self.imports = []
+        # (line, name) pairs, put in source order once the walk is done
+        self._imports = []
+    
+    def visit(self, tree):
+        """Visit every node once, dispatching on each node's exact type."""
+        handlers = self._handlers
+        for node in walk_unordered(tree):
+            handler = handlers.get(type(node))
+            if handler is not None:
+                handler(self, node)
+        
+        # The walk order isn't guaranteed, so report everything in source order
+        self.functions.sort(key=lambda func: func.start_line)
+        self.classes.sort(key=lambda cls: cls.start_line)
+        self._imports.sort(key=lambda item: item[0])
+        self.imports = [name for _, name in self._imports]
+    
+    def visit_FunctionDef(self, node):
+        # Get docstring if available (computed once here; the detector
+        # only checks the stored value)
+        docstring = ast.get_docstring(node)
+        
+        # Get arguments
+        args = tuple(arg.arg for arg in node.args.args)
+        
+        # Get function range (line numbers)
+        start_line = node.lineno
+        end_line = node.end_lineno or start_line
+        
+        self.functions.append(FunctionInfo(sys.intern(node.name), docstring, args, start_line, end_line))
+    
+    def visit_ClassDef(self, node):
+        # Get docstring if available (computed once here; the detector
+        # only checks the stored value)
+        docstring = ast.get_docstring(node)
+        
+        # Get methods
+        methods = tuple(child.name for child in node.body if isinstance(child, ast.FunctionDef))
+        
+        # Get class range (line numbers)
+        start_line = node.lineno
+        end_line = node.end_lineno or start_line
+        
+        self.classes.append(ClassInfo(sys.intern(node.name), docstring, methods, start_line, end_line))
+    
+    def visit_Import(self, node):
+        for name in node.names:
+            self._imports.append((node.lineno, sys.intern(name.name)))
+    
+    def visit_ImportFrom(self, node):
+        module = node.module
+        for name in node.names:
+            self._imports.append((node.lineno, sys.intern(f"{module}.{name.name}")))
+    
+    # Node type -> handler for the nodes the parser reports on
+    _handlers = {
+        ast.FunctionDef: visit_FunctionDef,
+        ast.ClassDef: visit_ClassDef,
+        ast.Import: visit_Import,
+        ast.ImportFrom: visit_ImportFrom,
+    }
+
 class CodeParser:
     """Parse Python code files and extract meaningful information."""
     
-    def parse(self, file_path):
-        """Parse a Python file and return structured information about it."""
+    def parse(self, file_path, collect_tokens=False):
+        """
+        Parse a Python file and return structured information about it.
+        
+        Token lists for files with syntax errors are only built when
+        collect_tokens is true, since nothing in the analyzer reads them.
+        """
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                code = file.read()
+            # Read the whole file in one large buffered read and decode it once
+            with open(file_path, 'rb', buffering=_READ_BUFFER_SIZE) as file:
+                source = file.read()
+            code = source.decode('utf-8', errors='replace')
+            
+            # Content hash lets the detector and suggester reuse earlier results
+            content_hash = hashlib.blake2b(source, digest_size=16).digest()
             
             # Basic info
             filename = os.path.basename(file_path)
-            lines = code.split('\n')
+            # Only \n, \r\n and \r end lines for Python, so split on those alone
+            # to keep line numbers in step with the AST and syntax errors
+            lines = code.replace('\r\n', '\n').replace('\r', '\n').split('\n')
+            if not lines[-1]:
+                # A final newline ends the last line rather than starting another
+                lines.pop()
             
             # Try to parse with AST
             try:
-                tree = ast.parse(code)
+                # Compile straight to an AST so errors carry the real filename
+                tree = compile(code, file_path, 'exec', ast.PyCF_ONLY_AST)
+                tokens = None
                 # Extract high-level code information
-                functions = self._extract_functions(tree)
-                classes = self._extract_classes(tree)
-                imports = self._extract_imports(tree)
+                extractor = _Extractor()
+                extractor.visit(tree)
+                functions = extractor.functions
+                classes = extractor.classes
+                imports = extractor.imports
                 has_syntax_errors = False
                 syntax_error_info = None
-            except SyntaxError as e:
+            except (SyntaxError, ValueError, RecursionError) as e:
                 # Still return partial information even with syntax errors
                 print(f"Warning: Syntax error in file: {e}")
                 tree = None
@@ -34,14 +160,14 @@ class CodeParser:
                 classes = []
                 imports = self._extract_imports_from_text(code)
                 has_syntax_errors = True
-                syntax_error_info = {
-                    'line': e.lineno,
-                    'offset': e.offset,
-                    'message': str(e)
-                }
+                syntax_error_info = {'message': str(e)}
+                # Null bytes and overly deep nesting may not report a position
+                if getattr(e, 'lineno', None) is not None:
+                    syntax_error_info['line'] = e.lineno
+                    syntax_error_info['offset'] = e.offset
                 
                 # Try to extract some basic information despite syntax errors
-                self._analyze_tokens(code)
+                tokens = self._analyze_tokens(source) if collect_tokens else None
             
             # Generate simple description
             description = self._generate_description(filename, functions, classes, imports, has_syntax_errors)
@@ -50,126 +176,83 @@ class CodeParser:
             return {
                 'filename': filename,
                 'code': code,
+                'hash': content_hash,
                 'ast': tree,
                 'functions': functions,
                 'classes': classes,
                 'imports': imports,
                 'description': description,
                 'lines': lines,
+                'tokens': tokens,
                 'has_syntax_errors': has_syntax_errors,
                 'syntax_error_info': syntax_error_info
             }
-        except Exception as e:
+        except OSError as e:
             print(f"Error processing file: {e}")
             return {
                 'filename': os.path.basename(file_path),
                 'code': '',
+                'hash': None,
                 'ast': None,
                 'functions': [],
                 'classes': [],
                 'imports': [],
                 'description': f"This file '{os.path.basename(file_path)}' could not be processed due to error: {str(e)}",
                 'lines': [],
+                'tokens': None,
                 'has_syntax_errors': True,
                 'syntax_error_info': {'message': str(e)}
             }
     
-    def _extract_functions(self, tree):
-        """Extract function definitions from AST."""
-        functions = []
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                # Get docstring if available
-                docstring = ast.get_docstring(node)
-                
-                # Get arguments
-                args = []
-                for arg in node.args.args:
-                    args.append(arg.arg)
-                
-                # Get function range (line numbers)
-                start_line = node.lineno
-                end_line = max([n.lineno for n in ast.walk(node) if hasattr(n, 'lineno')], default=start_line)
-                
-                functions.append({
-                    'name': node.name,
-                    'docstring': docstring,
-                    'args': args,
-                    'start_line': start_line,
-                    'end_line': end_line
-                })
-        return functions
-    
-    def _extract_classes(self, tree):
-        """Extract class definitions from AST."""
-        classes = []
-        for node in ast.walk(tree):
-            if isinstance(node, ast.ClassDef):
-                # Get docstring if available
-                docstring = ast.get_docstring(node)
-                
-                # Get methods
-                methods = []
-                for child in node.body:
-                    if isinstance(child, ast.FunctionDef):
-                        methods.append(child.name)
-                
-                # Get class range (line numbers)
-                start_line = node.lineno
-                end_line = max([n.lineno for n in ast.walk(node) if hasattr(n, 'lineno')], default=start_line)
-                
-                classes.append({
-                    'name': node.name,
-                    'docstring': docstring,
-                    'methods': methods,
-                    'start_line': start_line,
-                    'end_line': end_line
-                })
-        return classes
-    
-    def _extract_imports(self, tree):
-        """Extract import statements from AST."""
-        imports = []
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Import):
-                for name in node.names:
-                    imports.append(name.name)
-            elif isinstance(node, ast.ImportFrom):
-                module = node.module
-                for name in node.names:
-                    imports.append(f"{module}.{name.name}")
-        return imports
+    def parse_many(self, file_paths, max_workers=None):
+        """
+        Parse several Python files in parallel worker processes.
+        
+        Returns the parse results in the same order as file_paths. Only
+        parsing runs in the workers; detection and AI suggestions stay with
+        the caller so the model is never loaded more than once.
+        """
+        file_paths = list(file_paths)
+        if len(file_paths) < 2:
+            return [self.parse(file_path) for file_path in file_paths]
+        
+        workers = max_workers or os.cpu_count() or 1
+        # Batch files to amortize process communication, but keep every worker busy
+        chunksize = max(1, min(_PARSE_CHUNKSIZE, len(file_paths) // workers))
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self.parse, file_paths, chunksize=chunksize))
     
     def _extract_imports_from_text(self, code):
         """Extract imports by scanning the text (used when AST parsing fails)."""
         imports = []
-        import_pattern = re.compile(r'^import\s+([a-zA-Z0-9_.]+)')
-        from_import_pattern = re.compile(r'^from\s+([a-zA-Z0-9_.]+)\s+import\s+([a-zA-Z0-9_., ]+)')
+        import_match = _IMPORT_RE.match
+        from_import_match = _FROM_IMPORT_RE.match
         
-        for line in code.split('\n'):
+        for line in code.replace('\r\n', '\n').replace('\r', '\n').split('\n'):
             line = line.strip()
             
             # Check for 'import x'
-            match = import_pattern.match(line)
+            match = import_match(line)
             if match:
-                imports.append(match.group(1))
+                imports.append(sys.intern(match.group(1)))
                 continue
                 
             # Check for 'from x import y'
-            match = from_import_pattern.match(line)
+            match = from_import_match(line)
             if match:
                 module = match.group(1)
                 for name in match.group(2).split(','):
                     name = name.strip()
                     if name and name != '*':
-                        imports.append(f"{module}.{name}")
+                        imports.append(sys.intern(f"{module}.{name}"))
         
         return imports
     
-    def _analyze_tokens(self, code):
+    def _analyze_tokens(self, source):
         """Analyze code tokens for basic information when AST parsing fails."""
         try:
-            tokens = tokenize.tokenize(BytesIO(code.encode('utf-8')).readline)
+            # Tokenize the bytes read from disk rather than re-encoding the text
+            tokens = tokenize.tokenize(BytesIO(source).readline)
             token_list = list(tokens)
             
             # Extract token information if needed
@@ -191,10 +274,10 @@ class CodeParser:
                              (", and others..." if len(imports) > 5 else "."))
         
         if classes:
-            description.append(f"It defines {len(classes)} class(es): {', '.join([c['name'] for c in classes])}.")
+            description.append(f"It defines {len(classes)} class(es): {', '.join(c.name for c in classes)}.")
         
         if functions:
-            description.append(f"It contains {len(functions)} function(s): {', '.join([f['name'] for f in functions])}.")
+            description.append(f"It contains {len(functions)} function(s): {', '.join(f.name for f in functions)}.")
             
         if not classes and not functions:
             if has_syntax_errors:
@@ -1,198 +1,206 @@
 import argparse
+import hashlib
 import os
+import pickle
 import sys
-from trucode.analyzer.parser import CodeParser
-from trucode.analyzer.detector import IssueDetector
-from trucode.analyzer.suggester import CodeSuggester
-from trucode.analyzer.model_wrapper import ModelWrapper
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import repeat
+from trucode.utils.render import render_basic_analysis, render_report
+
+# Pickled analyses of unchanged files; kept in the user's own cache directory
+# because loading a pickle runs code
+_ANALYSIS_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'trucode')
+
+# Bump when the format of cached analyses changes
+_ANALYSIS_CACHE_VERSION = 3
+
+@dataclass(slots=True)
+class AnalysisResult:
+    """Outcome of analyzing one file, as returned by analyze_one."""
+    kind: str
+    file_path: str
+    parsed_code: dict | None = None
+    issues: list | None = None
+    suggestions: list | None = None
+    message: str | None = None
 
 def main():
     parser = argparse.ArgumentParser(description='Analyze Python code for issues and suggestions')
-    parser.add_argument('file_path', type=str, help='Path to the Python file to analyze')
+    parser.add_argument('file_paths', type=str, nargs='+', metavar='file_path', help='Path to a Python file to analyze')
     parser.add_argument('--verbose', '-v', action='store_true', help='Enable verbose output')
     parser.add_argument('--no-ai', action='store_true', help='Disable AI analysis')
     parser.add_argument('--force', action='store_true', help='Force detailed analysis even for files with syntax errors')
+    parser.add_argument('--no-cache', action='store_true', help='Re-analyze the file even if it is unchanged since the last run')
+    parser.add_argument('--jobs', '-j', type=int, default=1, help='Number of files to analyze in parallel (default: 1)')
     args = parser.parse_args()
     
-    if not os.path.exists(args.file_path):
-        print(f"Error: File not found: {args.file_path}")
-        return
-    
-    print(f"Analyzing {args.file_path}...")
-    
-    # Parse the code
-    code_parser = CodeParser()
-    parsed_code = code_parser.parse(args.file_path)
-    if not parsed_code:
-        print(f"Error: Could not open or process {args.file_path}")
-        return
-    
-    # Check if there are syntax errors
-    if parsed_code.get('has_syntax_errors', False) and not args.force:
-        print_basic_analysis(parsed_code, args.verbose)
-        return
-    
-    # Detect issues
-    print("Detecting code issues...")
-    detector = IssueDetector()
-    issues = detector.detect_issues(parsed_code)
-    
-    # Generate suggestions
-    print("Generating improvement suggestions...")
-    suggester = CodeSuggester()
-    
-    # Disable AI if requested
-    if args.no_ai:
-        # Monkey patch the model wrapper to return None
-        suggester.model_wrapper.load_model = lambda: False
+    options = {'no_ai': args.no_ai, 'force': args.force, 'no_cache': args.no_cache}
     
-    suggestions = suggester.generate_suggestions(parsed_code, issues)
-    
-    # Display results
-    print_results(args.file_path, parsed_code, issues, suggestions, args.verbose)
+    if args.jobs > 1 and len(args.file_paths) > 1:
+        # Each file is analyzed in a worker process; reports are still
+        # printed in the order the files were given
+        for result in analyze_many(args.file_paths, options, args.jobs):
+            print_analysis(result, args.verbose)
+    else:
+        for file_path in args.file_paths:
+            result = analyze_one(file_path, options)
+            if not args.no_ai:
+                _add_ai_suggestions([result])
+            print_analysis(result, args.verbose)
 
-def print_basic_analysis(parsed_code, verbose=False):
-    """Print basic analysis for files with syntax errors."""
-    print("\n" + "="*80)
-    print(f"BASIC ANALYSIS REPORT (SYNTAX ERRORS DETECTED): {parsed_code['filename']}")
-    print("="*80)
-    
-    # File information
-    print("\n📝 FILE INFORMATION:")
-    print(parsed_code['description'])
-    print(f"Total lines: {len(parsed_code['lines'])}")
-    
-    # Syntax error details
-    print("\n⚠️ SYNTAX ERROR DETAILS:")
-    error_info = parsed_code.get('syntax_error_info', {})
-    if error_info:
-        print(f"  Error on line {error_info.get('line', 'unknown')}: {error_info.get('message', 'Unknown error')}")
-        
-        # Show the problematic line if available
-        if 'line' in error_info and error_info['line'] <= len(parsed_code['lines']):
-            line_num = error_info['line']
-            line_content = parsed_code['lines'][line_num - 1]
-            print(f"\n  Line {line_num}: {line_content}")
-            
-            # Show a pointer to the error position if available
-            if 'offset' in error_info and error_info['offset'] > 0:
-                pointer = ' ' * (len(f"  Line {line_num}: ") + error_info['offset'] - 1) + '^'
-                print(pointer)
-    
-    # Basic code checks
-    print("\n🔍 BASIC CODE CHECKS:")
-    
-    # Check for mixed tabs and spaces
-    has_tabs = any('\t' in line for line in parsed_code['lines'])
-    has_spaces = any('    ' in line for line in parsed_code['lines'])
-    if has_tabs and has_spaces:
-        print("  ⚠️ Mixed tabs and spaces detected - this can cause indentation errors")
-    
-    # Check for common syntax issues
-    missing_colons = []
-    unclosed_parentheses = []
-    unclosed_quotes = []
-    
-    open_parens = 0
-    in_single_quote = False
-    in_double_quote = False
+def analyze_one(file_path, options):
+    """
+    Run the analysis pipeline on one file, without AI suggestions.
+    
+    Args:
+        file_path: Path to the Python file to analyze
+        options: Dictionary with the 'no_ai', 'force' and 'no_cache' settings
+    
+    Returns:
+        AnalysisResult whose kind is 'error', 'basic' (syntax errors, not
+        forced) or 'full', with the fields that kind uses filled in; AI
+        suggestions are added afterwards by _add_ai_suggestions
+    """
+    # Import the analyzer only once there is something to analyze, so --help
+    # and argument errors stay fast
+    from trucode.analyzer import get_parser, get_detector, get_suggester
+    
+    if not os.path.exists(file_path):
+        return AnalysisResult('error', file_path, message=f"Error: File not found: {file_path}")
+    
+    print(f"Analyzing {file_path}...")
+    
+    # Reuse the previous analysis if the file hasn't changed since
+    cache_file = _analysis_cache_file(file_path)
+    stamp = _file_stamp(file_path)
+    cached = None if options['no_cache'] else _load_cached_analysis(cache_file, stamp)
+    if cached is not None:
+        parsed_code, issues, suggestions = cached
+    else:
+        # Parse the code
+        code_parser = get_parser()
+        parsed_code = code_parser.parse(file_path)
+        if not parsed_code:
+            return AnalysisResult('error', file_path, message=f"Error: Could not open or process {file_path}")
+        issues = suggestions = None
     
-    for i, line in enumerate(parsed_code['lines'], 1):
-        stripped = line.strip()
+    # Check if there are syntax errors
+    if parsed_code.get('has_syntax_errors', False) and not options['force']:
+        return AnalysisResult('basic', file_path, parsed_code)
+    
+    if cached is None:
+        # Detect issues
+        print("Detecting code issues...")
+        detector = get_detector()
+        issues = detector.detect_issues(parsed_code)
         
-        # Check for missing colons
-        if stripped and stripped.startswith(('def ', 'class ', 'if ', 'else', 'elif ', 'for ', 'while ', 'try', 'except ', 'finally')):
-            if not stripped.endswith(':'):
-                missing_colons.append(i)
+        # Generate rule-based suggestions; the model never loads here, and AI
+        # results are cached by the model wrapper itself
+        print("Generating improvement suggestions...")
+        suggester = get_suggester(load_model=False)
         
-        # Count unclosed quotes and parentheses (very basic check)
-        for char in line:
-            if char == '(' and not in_single_quote and not in_double_quote:
-                open_parens += 1
-            elif char == ')' and not in_single_quote and not in_double_quote:
-                open_parens -= 1
-                if open_parens < 0:
-                    unclosed_parentheses.append(i)
-                    open_parens = 0
-            elif char == "'" and not in_double_quote:
-                in_single_quote = not in_single_quote
-            elif char == '"' and not in_single_quote:
-                in_double_quote = not in_double_quote
+        suggestions = suggester.generate_suggestions(parsed_code, issues)
         
-        if in_single_quote or in_double_quote:
-            unclosed_quotes.append(i)
-            in_single_quote = False
-            in_double_quote = False
-    
-    if open_parens > 0:
-        unclosed_parentheses.append(len(parsed_code['lines']))
-    
-    # Report issues
-    if missing_colons:
-        print(f"  ⚠️ Possibly missing colons on lines: {', '.join(map(str, missing_colons[:5]))}" + 
-              ("..." if len(missing_colons) > 5 else ""))
-    
-    if unclosed_parentheses:
-        print(f"  ⚠️ Possible unclosed parentheses on lines: {', '.join(map(str, unclosed_parentheses[:5]))}" + 
-              ("..." if len(unclosed_parentheses) > 5 else ""))
-    
-    if unclosed_quotes:
-        print(f"  ⚠️ Possible unclosed quotes on lines: {', '.join(map(str, unclosed_quotes[:5]))}" + 
-              ("..." if len(unclosed_quotes) > 5 else ""))
-    
-    # Show imports
-    if parsed_code.get('imports'):
-        print("\n📦 DETECTED IMPORTS:")
-        for i, imp in enumerate(parsed_code['imports'], 1):
-            print(f"  {i}. {imp}")
+        # The reports never read the tree or tokens, which would make up most
+        # of the pickle
+        cached_code = {**parsed_code, 'ast': None, 'tokens': None}
+        _store_cached_analysis(cache_file, stamp, (cached_code, issues, suggestions))
     
-    print("\n" + "="*80)
-    print("To run a more detailed analysis despite syntax errors, use the --force flag")
-    print("="*80)
+    return AnalysisResult('full', file_path, parsed_code, issues, suggestions)
 
-def print_results(file_path, parsed_code, issues, suggestions, verbose):
-    print("\n" + "="*80)
-    print(f"CODE ANALYSIS REPORT: {file_path}")
-    print("="*80)
-    
-    # Syntax error warning if using --force
-    if parsed_code.get('has_syntax_errors', False):
-        print("\n⚠️ WARNING: This file contains syntax errors. Analysis may be incomplete.")
-        error_info = parsed_code.get('syntax_error_info', {})
-        if error_info:
-            print(f"  Error on line {error_info.get('line', 'unknown')}: {error_info.get('message', 'Unknown error')}")
-    
-    # Code description
-    print("\n📝 CODE DESCRIPTION:")
-    print(parsed_code['description'])
+def analyze_many(file_paths, options, jobs):
+    """
+    Run the analysis pipeline on several files in worker processes.
+    
+    Args:
+        file_paths: Paths to the Python files to analyze
+        options: Dictionary with the 'no_ai', 'force' and 'no_cache' settings
+        jobs: Number of worker processes
+    
+    Returns:
+        Iterator of AnalysisResult objects in the order of file_paths
+    """
+    # Workers never load the model, since each would need its own copy in
+    # memory; AI suggestions are added here with one batched model call
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        results = executor.map(analyze_one, file_paths, repeat(options), chunksize=4)
+        if options['no_ai']:
+            # Nothing left to add, so reports can be printed as workers finish
+            yield from results
+            return
+        results = list(results)
+    
+    _add_ai_suggestions(results)
+    yield from results
+
+def _add_ai_suggestions(results):
+    """Append AI suggestions to the full analyses among results with one batched model call."""
+    full_results = [result for result in results if result.kind == 'full']
+    if not full_results:
+        return
     
-    # Issues
-    print("\n❌ ISSUES DETECTED:")
-    if issues:
-        for i, issue in enumerate(issues, 1):
-            print(f"\n  Issue #{i}: {issue['type']}")
-            print(f"  Line {issue['line']}: {issue['message']}")
-            if issue.get('suggestion'):
-                print(f"  Suggestion: {issue['suggestion']}")
-            if verbose and issue.get('context'):
-                print(f"  Context: {issue['context']}")
-    else:
-        print("  No issues detected!")
+    from trucode.analyzer import get_suggester
     
-    # Suggestions
-    print("\n✨ IMPROVEMENT SUGGESTIONS:")
-    if suggestions:
-        for i, suggestion in enumerate(suggestions, 1):
-            print(f"\n  Suggestion #{i}: {suggestion['title']}")
-            print(f"  Description: {suggestion['description']}")
-            if suggestion.get('code'):
-                print(f"\n  Example implementation:\n")
-                for line in suggestion['code'].split('\n'):
-                    print(f"    {line}")
+    print("Generating AI suggestions...")
+    ai_suggestions = get_suggester().generate_ai_suggestions_batch(
+        [result.parsed_code for result in full_results])
+    for result, suggestions in zip(full_results, ai_suggestions):
+        result.suggestions = result.suggestions + suggestions
+
+def print_analysis(result, verbose=False):
+    """Print the report for a result returned by analyze_one."""
+    if result.kind == 'error':
+        print(result.message)
+    elif result.kind == 'basic':
+        print_basic_analysis(result.parsed_code, verbose)
     else:
-        print("  No suggestions available.")
-    
-    print("\n" + "="*80)
+        print_results(result.file_path, result.parsed_code, result.issues, result.suggestions, verbose)
+
+def _analysis_cache_file(file_path):
+    """Return the cache path for a file's analysis, keyed by its path."""
+    # The file's mtime and size are stored in the entry rather than the name,
+    # so re-analyzing an edited file overwrites its stale entry
+    key_material = f"{_ANALYSIS_CACHE_VERSION}|{os.path.abspath(file_path)}"
+    cache_key = hashlib.blake2b(key_material.encode('utf-8'), digest_size=16).hexdigest()
+    return os.path.join(_ANALYSIS_CACHE_DIR, f"analysis_{cache_key}.pkl")
+
+def _file_stamp(file_path):
+    """Return the (mtime, size) pair that tells whether a file has changed."""
+    stat = os.stat(file_path)
+    return stat.st_mtime_ns, stat.st_size
+
+def _load_cached_analysis(cache_file, stamp):
+    """Load a cached (parsed_code, issues, suggestions) tuple, or None if unavailable or stale."""
+    try:
+        with open(cache_file, 'rb') as f:
+            cached_stamp, analysis = pickle.load(f)
+    except Exception:
+        # A missing or unreadable cache entry just means analyzing again
+        return None
+    return analysis if cached_stamp == stamp else None
+
+def _store_cached_analysis(cache_file, stamp, analysis):
+    """Write an analysis and its file's stamp to the cache, warning if it can't be saved."""
+    try:
+        os.makedirs(_ANALYSIS_CACHE_DIR, exist_ok=True)
+        with open(cache_file, 'wb') as f:
+            pickle.dump((stamp, analysis), f, protocol=pickle.HIGHEST_PROTOCOL)
+    except (OSError, pickle.PicklingError) as e:
+        print(f"Could not cache analysis result: {e}")
+
+def print_basic_analysis(parsed_code, verbose=False):
+    """Print basic analysis for files with syntax errors."""
+    _write_report(render_basic_analysis(parsed_code))
+
+def print_results(file_path, parsed_code, issues, suggestions, verbose):
+    """Print the full analysis report for a file."""
+    _write_report(render_report(file_path, parsed_code, issues, suggestions, verbose))
+
+def _write_report(lines):
+    """Write the report lines to stdout with a single write."""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -4,4 +4,4 @@ TruCode Utilities Package
 This package contains utility functions used by the TruCode analyzer.
 """
 
-__all__ = ['helpers']
\ No newline at end of file
+__all__ = ['helpers', 'render']
\ No newline at end of file
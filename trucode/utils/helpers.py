@@ -2,6 +2,12 @@
 Helper functions for code analysis and transformation.
 """
 
+import re
+
+# Code before a comment: anything but quotes or '#', complete string literals
+# (which may contain '#'), or a stray unterminated quote
+_CODE_RE = re.compile(r"""(?:[^'"#]|"(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*'|['"])*""")
+
 def get_line_content(lines, line_number):
     """
     Get the content of a specific line (1-based indexing).
@@ -13,9 +19,13 @@ def get_line_content(lines, line_number):
     Returns:
         The content of the line, or None if line number is out of range
     """
-    if 1 <= line_number <= len(lines):
+    # Negative indexes would silently count from the end
+    if line_number < 1:
+        return None
+    try:
         return lines[line_number - 1]
-    return None
+    except IndexError:
+        return None
 
 def extract_code_from_line(line):
     """
@@ -25,8 +35,10 @@ def extract_code_from_line(line):
         line: A line of code that may contain comments
         
     Returns:
-        The code portion of the line with comments removed and whitespace trimmed
+        The code portion of the line with comments removed and whitespace trimmed;
+        a '#' inside a string literal does not start a comment
     """
-    if '#' in line:
-        line = line.split('#')[0]
-    return line.strip()
\ No newline at end of file
+    # Lines without '#' can't contain a comment
+    if '#' not in line:
+        return line.strip()
+    return _CODE_RE.match(line).group().strip()
\ No newline at end of file
@@ -0,0 +1,156 @@
+"""
+Rendering of analysis reports as lines of text.
+"""
+
+import re
+
+# Statements that open a block and must end with a colon
+_BLOCK_KEYWORDS = frozenset({'def', 'class', 'if', 'elif', 'else', 'for', 'while', 'try', 'except', 'finally'})
+
+# Complete single- or double-quoted string literals, including escapes
+_STRING_RE = re.compile(r""""(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*'""")
+
+def render_basic_analysis(parsed_code):
+    """Yield the lines of the basic report for a file with syntax errors."""
+    lines = parsed_code['lines']
+    line_count = len(lines)
+    error_info = parsed_code.get('syntax_error_info') or {}
+    
+    yield "\n" + "="*80
+    yield f"BASIC ANALYSIS REPORT (SYNTAX ERRORS DETECTED): {parsed_code['filename']}"
+    yield "="*80
+    
+    # File information
+    yield "\n📝 FILE INFORMATION:"
+    yield parsed_code['description']
+    yield f"Total lines: {line_count}"
+    
+    # Syntax error details
+    yield "\n⚠️ SYNTAX ERROR DETAILS:"
+    if error_info:
+        yield f"  Error on line {error_info.get('line', 'unknown')}: {error_info.get('message', 'Unknown error')}"
+        
+        # Show the problematic line if available
+        if 'line' in error_info and error_info['line'] <= line_count:
+            line_num = error_info['line']
+            line_content = lines[line_num - 1]
+            prefix = f"  Line {line_num}: "
+            yield f"\n{prefix}{line_content}"
+            
+            # Show a pointer to the error position if available
+            if 'offset' in error_info and error_info['offset'] > 0:
+                # Right-align the caret under the offending column
+                yield '^'.rjust(len(prefix) + error_info['offset'])
+    
+    # Basic code checks
+    yield "\n🔍 BASIC CODE CHECKS:"
+    
+    # Check for mixed tabs and spaces
+    code = parsed_code['code']
+    has_tabs = '\t' in code
+    has_spaces = '    ' in code
+    if has_tabs and has_spaces:
+        yield "  ⚠️ Mixed tabs and spaces detected - this can cause indentation errors"
+    
+    # Check for common syntax issues
+    missing_colons = []
+    unclosed_parentheses = []
+    unclosed_quotes = []
+    
+    open_parens = 0
+    
+    for i, line in enumerate(lines, 1):
+        stripped = line.strip()
+        
+        # Check for missing colons; the first word may run straight into
+        # "(" or ":" as in "if(x):" or "else:"
+        first_word = stripped.partition(' ')[0].partition('(')[0].rstrip(':')
+        if first_word in _BLOCK_KEYWORDS and not stripped.endswith(':'):
+            missing_colons.append(i)
+        
+        # Count unclosed quotes and parentheses (very basic check) on the line
+        # with complete strings and any trailing comment removed; most lines
+        # have neither, so only pay for the regex when a quote is present
+        cleaned = _STRING_RE.sub('', line) if "'" in line or '"' in line else line
+        if '#' in cleaned:
+            cleaned = cleaned.partition('#')[0]
+        
+        open_parens += cleaned.count('(') - cleaned.count(')')
+        if open_parens < 0:
+            unclosed_parentheses.append(i)
+            open_parens = 0
+        
+        # Any quote left over starts a string that isn't closed on this line
+        if "'" in cleaned or '"' in cleaned:
+            unclosed_quotes.append(i)
+    
+    if open_parens > 0:
+        unclosed_parentheses.append(line_count)
+    
+    # Report issues
+    if missing_colons:
+        yield (f"  ⚠️ Possibly missing colons on lines: {', '.join(map(str, missing_colons[:5]))}" +
+               ("..." if len(missing_colons) > 5 else ""))
+    
+    if unclosed_parentheses:
+        yield (f"  ⚠️ Possible unclosed parentheses on lines: {', '.join(map(str, unclosed_parentheses[:5]))}" +
+               ("..." if len(unclosed_parentheses) > 5 else ""))
+    
+    if unclosed_quotes:
+        yield (f"  ⚠️ Possible unclosed quotes on lines: {', '.join(map(str, unclosed_quotes[:5]))}" +
+               ("..." if len(unclosed_quotes) > 5 else ""))
+    
+    # Show imports
+    if parsed_code.get('imports'):
+        yield "\n📦 DETECTED IMPORTS:"
+        for i, imp in enumerate(parsed_code['imports'], 1):
+            yield f"  {i}. {imp}"
+    
+    yield "\n" + "="*80
+    yield "To run a more detailed analysis despite syntax errors, use the --force flag"
+    yield "="*80
+
+def render_report(file_path, parsed_code, issues, suggestions, verbose=False):
+    """Yield the lines of the full analysis report for a file."""
+    yield "\n" + "="*80
+    yield f"CODE ANALYSIS REPORT: {file_path}"
+    yield "="*80
+    
+    # Syntax error warning if using --force
+    if parsed_code.get('has_syntax_errors', False):
+        yield "\n⚠️ WARNING: This file contains syntax errors. Analysis may be incomplete."
+        error_info = parsed_code.get('syntax_error_info', {})
+        if error_info:
+            yield f"  Error on line {error_info.get('line', 'unknown')}: {error_info.get('message', 'Unknown error')}"
+    
+    # Code description
+    yield "\n📝 CODE DESCRIPTION:"
+    yield parsed_code['description']
+    
+    # Issues
+    yield "\n❌ ISSUES DETECTED:"
+    if issues:
+        for i, issue in enumerate(issues, 1):
+            yield f"\n  Issue #{i}: {issue['type']}"
+            yield f"  Line {issue['line']}: {issue['message']}"
+            if issue.get('suggestion'):
+                yield f"  Suggestion: {issue['suggestion']}"
+            if verbose and issue.get('context'):
+                yield f"  Context: {issue['context']}"
+    else:
+        yield "  No issues detected!"
+    
+    # Suggestions
+    yield "\n✨ IMPROVEMENT SUGGESTIONS:"
+    if suggestions:
+        for i, suggestion in enumerate(suggestions, 1):
+            yield f"\n  Suggestion #{i}: {suggestion['title']}"
+            yield f"  Description: {suggestion['description']}"
+            if suggestion.get('code'):
+                yield f"\n  Example implementation:\n"
+                for line in suggestion['code'].split('\n'):
+                    yield f"    {line}"
+    else:
+        yield "  No suggestions available."
+    
+    yield "\n" + "="*80